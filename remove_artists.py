@@ -1,11 +1,23 @@
 import argparse
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import dotenv
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 try:
     from mutagen import File as MutagenFile
+    from mutagen.id3 import ID3
+    from mutagen.mp4 import MP4
 except Exception:
     MutagenFile = None
+    ID3 = None
+    MP4 = None
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 DEFAULT_OUTPUT_FOLDER = os.path.join(SCRIPT_DIR, "DownloadedMusic")
@@ -18,20 +30,28 @@ ARTISTS = [
 AUDIO_EXTS = {".mp3", ".m4a", ".webm", ".opus", ".aac", ".flac", ".wav"}
 IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".webp", ".bmp", ".gif"}
 IGNORED_FILES = {"thumbs.db", "desktop.ini", ".ds_store"}
+_AUDIO_EXT_TUPLE = tuple(AUDIO_EXTS)
+_ALBUM_ART_NAMES = {"album_art"} | {f"album_art{ext}" for ext in IMAGE_EXTS}
+CLASSIFY_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+
+class _NormalizeTable(dict):
+    """str.translate table mapping non-alphanumerics to spaces, filled lazily."""
+
+    def __missing__(self, codepoint):
+        value = codepoint if chr(codepoint).isalnum() else " "
+        self[codepoint] = value
+        return value
 
 
+_NORMALIZE_TABLE = _NormalizeTable()
+
+
+@lru_cache(maxsize=8192)
 def normalize(text):
     if not text:
         return ""
-    cleaned = []
-    for ch in text.lower():
-        if ch.isalnum():
-            cleaned.append(ch)
-        elif ch.isspace():
-            cleaned.append(" ")
-        else:
-            cleaned.append(" ")
-    return " ".join("".join(cleaned).split())
+    return " ".join(text.lower().translate(_NORMALIZE_TABLE).split())
 
 
 def load_base_dir():
@@ -46,75 +66,177 @@ def load_base_dir():
 
 def build_artist_index(artists):
     entries = []
+    alternatives = []
+    groups = {}
     for name in artists:
-        norm = normalize(name)
-        entries.append(
-            {
-                "name": name,
-                "norm": norm,
-                "compact": norm.replace(" ", ""),
-                "tokens": norm.split(),
-            }
-        )
-    return entries
-
-
-def text_matches_artist(text, entry):
-    text_norm = normalize(text)
-    if not text_norm:
-        return False
-    if entry["compact"] and entry["compact"] in text_norm.replace(" ", ""):
-        return True
-    tokens = entry["tokens"]
-    if not tokens:
-        return False
-    text_tokens = text_norm.split()
-    if len(text_tokens) < len(tokens):
-        return False
-    for idx in range(len(text_tokens) - len(tokens) + 1):
-        if text_tokens[idx : idx + len(tokens)] == tokens:
-            return True
-    return False
-
-
-def find_artist_match(candidates, artist_entries):
+        entry = {"name": name, "compact": normalize(name).replace(" ", "")}
+        if entry["compact"]:
+            group = f"a{len(entries)}"
+            alternatives.append(f"(?P<{group}>{re.escape(entry['compact'])})")
+            groups[group] = len(entries)
+        entries.append(entry)
+    pattern = re.compile("|".join(alternatives)) if alternatives else None
+    automaton = None
+    if ahocorasick is not None and pattern is not None:
+        automaton = ahocorasick.Automaton()
+        for index, entry in enumerate(entries):
+            # Keep the first artist for duplicate keys, as the regex does.
+            if entry["compact"] and entry["compact"] not in automaton:
+                automaton.add_word(entry["compact"], index)
+        automaton.make_automaton()
+    return {
+        "entries": entries,
+        "pattern": pattern,
+        "groups": groups,
+        "automaton": automaton,
+    }
+
+
+def text_matches_artist(text_compact, entry):
+    return bool(text_compact and entry["compact"] and entry["compact"] in text_compact)
+
+
+def find_artist_match(candidates, artist_index):
+    pattern = artist_index["pattern"]
+    if pattern is None:
+        return None
+    entries = artist_index["entries"]
+    automaton = artist_index["automaton"]
     for candidate in candidates:
-        for entry in artist_entries:
-            if text_matches_artist(candidate, entry):
+        text_compact = normalize(candidate).replace(" ", "")
+        if automaton is not None:
+            hits = [index for _, index in automaton.iter(text_compact)]
+            if hits:
+                return entries[min(hits)]["name"]
+            continue
+        match = pattern.search(text_compact)
+        if not match:
+            continue
+        # The leftmost hit is not necessarily the first configured artist,
+        # so confirm in list order up to the artist that matched.
+        last = artist_index["groups"][match.lastgroup]
+        for entry in entries[: last + 1]:
+            if text_matches_artist(text_compact, entry):
                 return entry["name"]
     return None
 
 
-def collect_audio_files(base_dir):
-    for root, _, files in os.walk(base_dir):
-        for filename in files:
-            ext = os.path.splitext(filename)[1].lower()
-            if ext in AUDIO_EXTS:
-                yield os.path.join(root, filename)
+def _walk(base_dir):
+    """Like os.walk(topdown=False), but yields DirEntry lists to avoid extra stats."""
+    stack = [base_dir]
+    while stack:
+        top = stack.pop()
+        if isinstance(top, tuple):
+            yield top
+            continue
+        try:
+            with os.scandir(top) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        dirs = []
+        files = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                is_dir = False
+            if is_dir:
+                dirs.append(entry)
+            else:
+                files.append(entry)
+        stack.append((top, dirs, files))
+        stack.extend(entry.path for entry in reversed(dirs))
+
+
+def rename_album_art(entry, prefix, names_lower, dry_run):
+    """Rename an album_art image to cover; return "renamed", "skipped" or None.
+
+    names_lower holds the lowercased names already in the directory, so the
+    target check needs no stat and never overwrites a cover in any case.
+    """
+    ext = os.path.splitext(entry.name)[1]
+    src = entry.path
+    target_name = f"cover{ext}"
+    target = prefix + target_name
+    if target_name.lower() in names_lower:
+        if dry_run:
+            print(f"[DRY-RUN] Skip rename (target exists): {src} -> {target}")
+        return "skipped"
+    if dry_run:
+        print(f"[DRY-RUN] Rename: {src} -> {target}")
+    else:
+        try:
+            os.rename(src, target)
+            print(f"Renamed: {src} -> {target}")
+        except OSError as exc:
+            print(f"Failed to rename {src}: {exc}")
+            return None
+        names_lower.add(target_name.lower())
+    return "renamed"
+
 
+def process_tree(base_dir, dry_run):
+    """Walk base_dir once, bottom-up, renaming album art along the way.
 
-def cleanup_empty_folders(base_dir, dry_run):
+    Returns the audio files found, a post-order list of
+    (dirpath, subdir paths, file names) for cleanup_empty_folders, and the
+    renamed/skipped album art counts.
+    """
+    audio_files = []
+    directories = []
+    renamed = 0
+    skipped = 0
+    for root, dirs, files in _walk(base_dir):
+        prefix = os.path.join(root, "")
+        names = []
+        names_lower = None
+        for entry in files:
+            name = entry.name
+            lower = name.lower()
+            if lower in _ALBUM_ART_NAMES:
+                if names_lower is None:
+                    names_lower = {e.name.lower() for e in files}
+                    names_lower.update(e.name.lower() for e in dirs)
+                status = rename_album_art(entry, prefix, names_lower, dry_run)
+                if status == "renamed":
+                    renamed += 1
+                    if not dry_run:
+                        name = "cover" + os.path.splitext(name)[1]
+                elif status == "skipped":
+                    skipped += 1
+            elif lower.endswith(_AUDIO_EXT_TUPLE):
+                audio_files.append(entry.path)
+            names.append(name)
+        directories.append((root, [entry.path for entry in dirs], names))
+    return audio_files, directories, renamed, skipped
+
+
+def cleanup_empty_folders(base_dir, directories, removed_files, dry_run):
     removed = 0
-    base_abs = os.path.abspath(base_dir)
-    for root, dirs, files in os.walk(base_dir, topdown=False):
-        if os.path.abspath(root) == base_abs:
+    # directories is post-order, so every child is settled before its parent.
+    removed_dirs = set()
+    for root, subdirs, names in directories:
+        if root == base_dir:
             continue
-        existing_dirs = [
-            name for name in dirs if os.path.isdir(os.path.join(root, name))
-        ]
+        existing_dirs = [path for path in subdirs if path not in removed_dirs]
         if existing_dirs:
             continue
 
+        prefix = os.path.join(root, "")
         cover_files = []
         other_files = []
-        for filename in files:
-            lower = filename.lower()
+        for name in names:
+            path = prefix + name
+            if path in removed_files:
+                continue
+            lower = name.lower()
             if lower in IGNORED_FILES:
                 continue
             if lower == "cover.jpg":
-                cover_files.append(filename)
+                cover_files.append(path)
                 continue
-            other_files.append(filename)
+            other_files.append(path)
 
         if other_files:
             continue
@@ -124,88 +246,69 @@ def cleanup_empty_folders(base_dir, dry_run):
             removed += 1
             continue
 
-        for filename in cover_files:
+        for path in cover_files:
             try:
-                os.remove(os.path.join(root, filename))
+                os.remove(path)
             except OSError as exc:
-                print(f"Failed to remove {os.path.join(root, filename)}: {exc}")
+                print(f"Failed to remove {path}: {exc}")
         try:
             os.rmdir(root)
             removed += 1
+            removed_dirs.add(root)
         except OSError as exc:
             print(f"Failed to remove folder {root}: {exc}")
     return removed
 
 
-def rename_album_art(base_dir, dry_run):
-    renamed = 0
-    skipped = 0
-    for root, _, files in os.walk(base_dir):
-        for filename in files:
-            base, ext = os.path.splitext(filename)
-            if ext and ext.lower() not in IMAGE_EXTS:
-                continue
-            if base.lower() != "album_art":
-                continue
-            src = os.path.join(root, filename)
-            target = os.path.join(root, f"cover{ext}")
-            if os.path.exists(target):
-                skipped += 1
-                if dry_run:
-                    print(f"[DRY-RUN] Skip rename (target exists): {src} -> {target}")
-                continue
-            if dry_run:
-                print(f"[DRY-RUN] Rename: {src} -> {target}")
-            else:
-                try:
-                    os.rename(src, target)
-                    print(f"Renamed: {src} -> {target}")
-                except OSError as exc:
-                    print(f"Failed to rename {src}: {exc}")
-                    continue
-            renamed += 1
-    return renamed, skipped
-
-
 def load_hash_cache(cache_path):
     cache = {}
     if not os.path.exists(cache_path):
         return cache
     try:
         with open(cache_path, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                parts = line.split("\t", 3)
-                if len(parts) != 4:
-                    continue
-                file_hash, rel_path, size_text, mtime_text = parts
-                cache[rel_path] = (file_hash, size_text, mtime_text)
+            data = f.read()
     except OSError as exc:
         print(f"Failed to read hash cache: {exc}")
-    return cache
+        return cache
+    # Split on "\n" only: splitlines() would also break on characters such as
+    # U+2028 that may legitimately appear in a file name.
+    rows = (line.rstrip().split("\t", 3) for line in data.split("\n"))
+    return {row[1]: (row[0], row[2], row[3]) for row in rows if len(row) == 4}
 
 
 def save_hash_cache(cache_path, cache):
     try:
         with open(cache_path, "w", encoding="utf-8") as f:
-            for rel_path in sorted(cache.keys()):
-                file_hash, size_text, mtime_text = cache[rel_path]
-                f.write(f"{file_hash}\t{rel_path}\t{size_text}\t{mtime_text}\n")
+            f.write(
+                "".join(
+                    f"{file_hash}\t{rel_path}\t{size_text}\t{mtime_text}\n"
+                    for rel_path, (file_hash, size_text, mtime_text) in sorted(
+                        cache.items()
+                    )
+                )
+            )
     except OSError as exc:
         print(f"Failed to write hash cache: {exc}")
 
 
-def prune_hash_cache(base_dir, dry_run):
+def prune_hash_cache(base_dir, live_files, dry_run):
+    """Drop cache entries for files that no longer exist.
+
+    live_files is the set of relative audio paths still on disk, taken from
+    the tree walk; only entries outside it that are not audio need a stat.
+    """
     cache_path = os.path.join(base_dir, HASH_CACHE_FILENAME)
     cache = load_hash_cache(cache_path)
     if not cache:
         return 0
     removed = 0
+    prefix = os.path.join(base_dir, "")
     for rel_path in list(cache.keys()):
-        abs_path = os.path.join(base_dir, rel_path)
-        if not os.path.exists(abs_path):
+        if rel_path in live_files:
+            continue
+        if rel_path.lower().endswith(_AUDIO_EXT_TUPLE) or not os.path.exists(
+            prefix + rel_path
+        ):
             removed += 1
             del cache[rel_path]
     if removed and dry_run:
@@ -219,14 +322,25 @@ def prune_hash_cache(base_dir, dry_run):
 def extract_artist_tags(path):
     if MutagenFile is None:
         return []
+    ext = os.path.splitext(path)[1].lower()
+    artists = []
     try:
+        if ext == ".mp3":
+            tags = ID3(path)
+            for frame in tags.getall("TPE1") + tags.getall("TPE2"):
+                artists.extend(frame.text)
+            return [str(artist) for artist in artists if artist]
+        if ext == ".m4a":
+            tags = MP4(path).tags or {}
+            for key in ("\xa9ART", "aART"):
+                artists.extend(tags.get(key) or [])
+            return [str(artist) for artist in artists if artist]
         audio = MutagenFile(path, easy=True)
     except Exception:
         return []
     if not audio or not getattr(audio, "tags", None):
         return []
     tags = audio.tags
-    artists = []
     for key in ("artist", "albumartist", "album_artist"):
         value = tags.get(key)
         if not value:
@@ -238,6 +352,20 @@ def extract_artist_tags(path):
     return [artist for artist in artists if artist]
 
 
+def classify_audio_file(path, base_dir, artist_index):
+    rel_path = os.path.relpath(path, base_dir)
+    parts = rel_path.split(os.sep)
+    filename = os.path.splitext(parts[-1])[0]
+    candidates = [filename] + parts[:-1]
+    matched = find_artist_match(candidates, artist_index)
+    if not matched:
+        for artist_text in extract_artist_tags(path):
+            matched = find_artist_match([artist_text], artist_index)
+            if matched:
+                break
+    return path, matched
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Remove songs for specific artists and delete empty album folders."
@@ -254,42 +382,52 @@ def main():
         print(f"Base folder not found: {base_dir}")
         return 1
 
-    artist_entries = build_artist_index(ARTISTS)
+    artist_index = build_artist_index(ARTISTS)
     per_artist = {name: 0 for name in ARTISTS}
     removed_files = 0
 
-    renamed_images, skipped_images = rename_album_art(base_dir, args.dry_run)
-
-    for path in collect_audio_files(base_dir):
-        rel_path = os.path.relpath(path, base_dir)
-        parts = rel_path.split(os.sep)
-        filename = os.path.splitext(parts[-1])[0]
-        candidates = [filename] + parts[:-1]
-        matched = None
-        for artist_text in extract_artist_tags(path):
-            matched = find_artist_match([artist_text], artist_entries)
-            if matched:
-                break
-        if not matched:
-            matched = find_artist_match(candidates, artist_entries)
-        if not matched:
-            continue
-
-        if args.dry_run:
-            print(f"[DRY-RUN] Remove file: {path} (matched {matched})")
-        else:
-            try:
-                os.remove(path)
-                print(f"Removed: {path} (matched {matched})")
-            except OSError as exc:
-                print(f"Failed to remove {path}: {exc}")
+    audio_files, directories, renamed_images, skipped_images = process_tree(
+        base_dir, args.dry_run
+    )
+    removed_paths = set()
+
+    # Nothing can match without configured artists, so skip the per-file
+    # tag parsing entirely.
+    to_classify = audio_files if artist_index["pattern"] else ()
+
+    # Tag reads are I/O-bound, so classify in parallel; removals stay on this
+    # thread and in walk order so dry-run output is deterministic.
+    with ThreadPoolExecutor(max_workers=CLASSIFY_WORKERS) as executor:
+        results = executor.map(
+            lambda path: classify_audio_file(path, base_dir, artist_index),
+            to_classify,
+        )
+        for path, matched in results:
+            if not matched:
                 continue
 
-        removed_files += 1
-        per_artist[matched] = per_artist.get(matched, 0) + 1
+            if args.dry_run:
+                print(f"[DRY-RUN] Remove file: {path} (matched {matched})")
+            else:
+                try:
+                    os.remove(path)
+                    removed_paths.add(path)
+                    print(f"Removed: {path} (matched {matched})")
+                except OSError as exc:
+                    print(f"Failed to remove {path}: {exc}")
+                    continue
+
+            removed_files += 1
+            per_artist[matched] = per_artist.get(matched, 0) + 1
 
-    removed_folders = cleanup_empty_folders(base_dir, args.dry_run)
-    removed_hashes = prune_hash_cache(base_dir, args.dry_run)
+    removed_folders = cleanup_empty_folders(
+        base_dir, directories, removed_paths, args.dry_run
+    )
+    prefix_len = len(os.path.join(base_dir, ""))
+    live_files = {
+        path[prefix_len:] for path in audio_files if path not in removed_paths
+    }
+    removed_hashes = prune_hash_cache(base_dir, live_files, args.dry_run)
 
     print("\nSummary")
     print(f"Base folder: {base_dir}")
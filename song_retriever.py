@@ -1,16 +1,38 @@
 import os
+import atexit
 import json
 import ast
 import shutil
 import requests
 import hashlib
 import time
+import random
 import re
+import sqlite3
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import spotipy
 from spotipy.oauth2 import SpotifyClientCredentials
 import dotenv
 import yt_dlp
 
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 dotenv.load_dotenv()
 
 CLIENT_ID = os.getenv("CLIENT_ID")
@@ -23,6 +45,13 @@ client_credentials_manager = SpotifyClientCredentials(
 )
 sp = spotipy.Spotify(client_credentials_manager=client_credentials_manager)
 
+# Shared session so image downloads reuse keep-alive connections.
+HTTP_SESSION = requests.Session()
+HTTP_SESSION.mount(
+    "https://",
+    requests.adapters.HTTPAdapter(pool_connections=8, pool_maxsize=32),
+)
+
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 DEFAULT_OUTPUT_FOLDER = os.path.join(SCRIPT_DIR, "DownloadedMusic")
 SONGS_FILE = os.path.join(SCRIPT_DIR, "songs.txt")
@@ -30,6 +59,8 @@ ALBUMS_FILE = os.path.join(SCRIPT_DIR, "album.txt")
 PLAYLISTS_FILE = os.path.join(SCRIPT_DIR, "playlist.txt")
 ARTISTS_FILE = os.path.join(SCRIPT_DIR, "artist.txt")
 PLACEHOLDER_IMAGE = os.path.join(SCRIPT_DIR, "placeholder.jpg")
+SPOTIFY_CACHE_PATH = os.path.join(SCRIPT_DIR, ".spotify_cache.sqlite")
+DEFAULT_IMAGE_CACHE_FOLDER = os.path.join(SCRIPT_DIR, ".image_cache")
 
 
 def get_output_folder():
@@ -40,6 +71,23 @@ def get_output_folder():
         return env_path
     return DEFAULT_OUTPUT_FOLDER
 
+
+def get_image_cache_folder():
+    env_path = os.getenv("IMAGE_CACHE_FOLDER", "").strip()
+    if env_path:
+        if not os.path.isabs(env_path):
+            env_path = os.path.abspath(os.path.join(SCRIPT_DIR, env_path))
+        return env_path
+    return DEFAULT_IMAGE_CACHE_FOLDER
+
+
+def get_download_concurrency():
+    try:
+        return max(1, int(os.getenv("DOWNLOAD_CONCURRENCY", "4").strip()))
+    except ValueError:
+        return 4
+
+
 AUDIO_EXTS = (".mp3", ".m4a", ".webm", ".opus")
 
 DOWNLOAD_ATTEMPTS = 3
@@ -48,8 +96,46 @@ SPOTIFY_ATTEMPTS = 3
 RETRY_SLEEP_SECONDS = 3
 REQUEST_TIMEOUT_SECONDS = 30
 DEBUG = os.getenv("DEBUG", "0").strip() == "1"
+# Keep YouTube's own audio stream (m4a/opus) instead of re-encoding to MP3.
+KEEP_NATIVE_AUDIO = os.getenv("KEEP_NATIVE_AUDIO", "0").strip() == "1"
+# Hardlink duplicate tracks to the copy already on disk instead of dropping them.
+LINK_DUPLICATES = os.getenv("LINK_DUPLICATES", "0").strip() == "1"
 HASH_CACHE_FILENAME = ".audio_hashes.txt"
+HASH_CHUNK_SIZE = 4 * 1024 * 1024
 HASH_CACHE_STATE = None
+TRACK_INDEX_FILENAME = ".track_ids.txt"
+TRACK_INDEX_STATE = None
+# Guards known_hashes, the hash cache and the track index during parallel downloads.
+HASH_LOCK = threading.Lock()
+DOWNLOAD_CONCURRENCY = get_download_concurrency()
+# One long-lived download pool, so each worker thread keeps its YoutubeDL.
+DOWNLOAD_EXECUTOR = None
+YDL_LOCAL = threading.local()
+YDL_INSTANCES = []
+YDL_INSTANCES_LOCK = threading.Lock()
+SPOTIFY_CACHE_TTL_SECONDS = 24 * 60 * 60
+SPOTIFY_SEARCH_CACHE_TTL_SECONDS = 2 * 60
+# Concurrent page requests per paginated lookup; kept low for Spotify's rate limits.
+SPOTIFY_PAGE_WORKERS = 4
+# Spotify rejects search offsets past this many results.
+SPOTIFY_SEARCH_MAX_RESULTS = 1000
+SPOTIFY_CACHE_DB = None
+IMAGE_CACHE_FOLDER = get_image_cache_folder()
+IMAGE_CHUNK_SIZE = 64 * 1024
+SPOTIFY_CACHE_LOCK = threading.Lock()
+# Spotify requests are spaced at least this far apart across all threads.
+SPOTIFY_MIN_INTERVAL_SECONDS = 0.1
+SPOTIFY_MAX_BACKOFF_SECONDS = 60
+SPOTIFY_RATE_LOCK = threading.Lock()
+SPOTIFY_NEXT_CALL = 0.0
+# Tags each cached hash with its algorithm so entries written by another
+# algorithm are re-hashed instead of silently never matching.
+if blake3:
+    HASH_PREFIX = "blake3:"
+elif xxhash:
+    HASH_PREFIX = "xxh3:"
+else:
+    HASH_PREFIX = "blake2b:"
 
 INSTRUMENTAL_KEYWORDS = [
     "instrumental",
@@ -58,6 +144,22 @@ INSTRUMENTAL_KEYWORDS = [
     "no vocals",
 ]
 SPOTIFY_ID_REGEX = r"[A-Za-z0-9]{22}"
+SPOTIFY_ID_PATTERN = re.compile(SPOTIFY_ID_REGEX)
+SPOTIFY_URL_PATTERNS = {
+    entity_type: re.compile(
+        rf"open\.spotify\.com/{entity_type}/({SPOTIFY_ID_REGEX})", re.IGNORECASE
+    )
+    for entity_type in ("track", "album", "playlist", "artist")
+}
+INSTRUMENTAL_PATTERN = re.compile(
+    "|".join(re.escape(keyword) for keyword in INSTRUMENTAL_KEYWORDS), re.IGNORECASE
+)
+INSTRUMENTAL_AUTOMATON = None
+if ahocorasick is not None:
+    INSTRUMENTAL_AUTOMATON = ahocorasick.Automaton()
+    for keyword in INSTRUMENTAL_KEYWORDS:
+        INSTRUMENTAL_AUTOMATON.add_word(keyword, keyword)
+    INSTRUMENTAL_AUTOMATON.make_automaton()
 
 
 def debug(message):
@@ -65,43 +167,96 @@ def debug(message):
         print(f"[DEBUG] {message}")
 
 
+def image_cache_path(url):
+    key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    return os.path.join(IMAGE_CACHE_FOLDER, f"{key}.jpg")
+
+
+def store_cached_image(path, cache_path):
+    temp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(IMAGE_CACHE_FOLDER, exist_ok=True)
+        shutil.copyfile(path, temp_path)
+        os.replace(temp_path, cache_path)
+    except OSError as exc:
+        debug(f"Failed to cache image: {exc}")
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+
 def download_image(url, path):
     """Download the album image at roughly 300x300."""
     if not url:
         return
+    cache_path = image_cache_path(url)
+    if os.path.exists(cache_path):
+        try:
+            shutil.copyfile(cache_path, path)
+            debug(f"Image copied from cache: {cache_path} -> {path}")
+            return
+        except OSError as exc:
+            debug(f"Failed to copy cached image: {exc}")
     debug(f"Downloading image: {url} -> {path}")
+    # Stream into a temp file so an interrupted download never leaves a
+    # truncated image at path.
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
     for attempt in range(1, IMAGE_DOWNLOAD_ATTEMPTS + 1):
         try:
-            r = requests.get(url, timeout=REQUEST_TIMEOUT_SECONDS)
-            if r.status_code == 200:
-                with open(path, "wb") as f:
-                    f.write(r.content)
-                debug(f"Image saved: {path}")
-                return
-            print(f"Image download failed (status {r.status_code}): {url}")
+            with HTTP_SESSION.get(
+                url, timeout=REQUEST_TIMEOUT_SECONDS, stream=True
+            ) as r:
+                if r.status_code == 200:
+                    with open(temp_path, "wb") as f:
+                        for chunk in r.iter_content(IMAGE_CHUNK_SIZE):
+                            f.write(chunk)
+                    os.replace(temp_path, path)
+                    debug(f"Image saved: {path}")
+                    store_cached_image(path, cache_path)
+                    return
+                print(f"Image download failed (status {r.status_code}): {url}")
         except requests.RequestException as exc:
             print(f"Image download error (attempt {attempt}): {exc}")
+        finally:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
         if attempt < IMAGE_DOWNLOAD_ATTEMPTS:
             time.sleep(RETRY_SLEEP_SECONDS)
 
 
+INVALID_FILENAME_TABLE = str.maketrans(dict.fromkeys('\\/:*?"<>|', "_"))
+
+
+@lru_cache(maxsize=4096)
 def sanitize_filename(name):
     """Make filename safe for most filesystems."""
-    invalid_chars = '\\/:*?"<>|'
-    for ch in invalid_chars:
-        name = name.replace(ch, "_")
-    return name.strip()
+    return name.translate(INVALID_FILENAME_TABLE).strip()
+
+
+class _NameKeepTable(dict):
+    """str.translate table dropping everything but alphanumerics and whitespace, filled lazily."""
+
+    def __missing__(self, codepoint):
+        ch = chr(codepoint)
+        value = codepoint if ch.isalnum() or ch.isspace() else None
+        self[codepoint] = value
+        return value
+
+
+_NAME_KEEP_TABLE = _NameKeepTable()
 
 
+@lru_cache(maxsize=4096)
 def normalize_name(text):
-    return "".join(ch for ch in text.lower().strip() if ch.isalnum() or ch.isspace())
+    return text.lower().strip().translate(_NAME_KEEP_TABLE)
 
 
 def strip_quotes(text):
     text = text.strip()
-    if (text.startswith('"') and text.endswith('"')) or (
-        text.startswith("'") and text.endswith("'")
-    ):
+    if text and text[0] in "\"'" and text[-1] == text[0]:
         return text[1:-1].strip()
     return text
 
@@ -115,16 +270,12 @@ def extract_spotify_id(text, entity_type):
     if value.lower().startswith(prefix):
         value = value[len(prefix):]
     else:
-        match = re.search(
-            rf"open\.spotify\.com/{entity_type}/({SPOTIFY_ID_REGEX})",
-            value,
-            re.IGNORECASE,
-        )
+        match = SPOTIFY_URL_PATTERNS[entity_type].search(value)
         if match:
             value = match.group(1)
 
     value = value.split("?", 1)[0].split("/", 1)[0].strip()
-    if re.fullmatch(SPOTIFY_ID_REGEX, value):
+    if SPOTIFY_ID_PATTERN.fullmatch(value):
         return value
     return ""
 
@@ -140,7 +291,10 @@ def parse_list_file(path, allow_commas_in_items):
     if not content:
         return []
 
-    for parser in (json.loads, ast.literal_eval):
+    # Only bracketed, quoted or commented content can parse as a list or string
+    # literal; plain line-per-entry files skip the JSON and AST parsers entirely.
+    parsers = (json.loads, ast.literal_eval) if content[0] in "[(\"'#" else ()
+    for parser in parsers:
         try:
             data = parser(content)
         except Exception:
@@ -178,8 +332,9 @@ def parse_list_file(path, allow_commas_in_items):
 def is_instrumental_text(text):
     if not text:
         return False
-    lower = text.lower()
-    return any(keyword in lower for keyword in INSTRUMENTAL_KEYWORDS)
+    if INSTRUMENTAL_AUTOMATON is not None:
+        return next(INSTRUMENTAL_AUTOMATON.iter(text.lower()), None) is not None
+    return INSTRUMENTAL_PATTERN.search(text) is not None
 
 
 def yt_match_filter(info, *, incomplete):
@@ -191,47 +346,88 @@ def yt_match_filter(info, *, incomplete):
     return None
 
 
+def list_dir_names(path):
+    """Return the casefolded entry names in path, or an empty set if it is missing.
+
+    Names are casefolded on every platform so that names differing only in
+    case count as taken, as they do on case-insensitive filesystems.
+    """
+    try:
+        with os.scandir(path) as entries:
+            return {entry.name.casefold() for entry in entries}
+    except (FileNotFoundError, NotADirectoryError):
+        return set()
+
+
 def unique_folder_path(base_dir, folder_name):
-    candidate = os.path.join(base_dir, folder_name)
-    if not os.path.exists(candidate):
-        return candidate
+    existing = list_dir_names(base_dir)
+    candidate = folder_name
     counter = 2
-    while True:
-        candidate = os.path.join(base_dir, f"{folder_name} ({counter})")
-        if not os.path.exists(candidate):
-            return candidate
+    while candidate.casefold() in existing:
+        candidate = f"{folder_name} ({counter})"
         counter += 1
+    return os.path.join(base_dir, candidate)
 
 
-def unique_base_path(base_path):
-    candidate = base_path
+def unique_base_path(base_path, reserved=None, existing=None):
+    """Pick a free base path; names in reserved count as taken and the pick is added.
+
+    existing is an optional list_dir_names() result for the folder, so callers
+    placing many tracks in one folder only list it once. reserved holds
+    casefolded paths.
+    """
+    folder, stem = os.path.split(base_path)
+    if existing is None:
+        existing = list_dir_names(folder or ".")
+    candidate = stem
     counter = 2
-    while any(
-        os.path.exists(candidate + ext)
-        for ext in AUDIO_EXTS
-    ):
-        candidate = f"{base_path} ({counter})"
+    while (
+        reserved is not None
+        and os.path.join(folder, candidate).casefold() in reserved
+    ) or any((candidate + ext).casefold() in existing for ext in AUDIO_EXTS):
+        candidate = f"{stem} ({counter})"
         counter += 1
+    candidate = os.path.join(folder, candidate)
+    if reserved is not None:
+        reserved.add(candidate.casefold())
     return candidate
 
 
 def unique_file_path(path):
-    if not os.path.exists(path):
+    folder, name = os.path.split(path)
+    existing = list_dir_names(folder or ".")
+    if name.casefold() not in existing:
         return path
-    base, ext = os.path.splitext(path)
+    base, ext = os.path.splitext(name)
     counter = 2
     candidate = f"{base} ({counter}){ext}"
-    while os.path.exists(candidate):
+    while candidate.casefold() in existing:
         counter += 1
         candidate = f"{base} ({counter}){ext}"
-    return candidate
+    return os.path.join(folder, candidate)
 
 
 def build_ydl_opts(out_base_path):
     debug(f"Building yt-dlp options for: {out_base_path}")
+    postprocessors = [{"key": "FFmpegMetadata"}]
+    if not KEEP_NATIVE_AUDIO:
+        postprocessors.insert(
+            0,
+            {
+                "key": "FFmpegExtractAudio",
+                "preferredcodec": "mp3",
+                "preferredquality": "192",
+            },
+        )
     return {
-        "format": "bestaudio/best",
+        # Without the MP3 conversion a /best fallback would keep a muxed video
+        # that find_downloaded_file does not recognise, so take audio only.
+        "format": (
+            "bestaudio[ext=m4a]/bestaudio" if KEEP_NATIVE_AUDIO else "bestaudio/best"
+        ),
         "quiet": False,
+        # Progress bars from parallel downloads overwrite each other.
+        "noprogress": DOWNLOAD_CONCURRENCY > 1,
         "noplaylist": True,
         "default_search": "ytsearch1",
         "match_filter": yt_match_filter,
@@ -241,16 +437,7 @@ def build_ydl_opts(out_base_path):
         "socket_timeout": REQUEST_TIMEOUT_SECONDS,
         "retry_sleep": RETRY_SLEEP_SECONDS,
         "outtmpl": f"{out_base_path}.%(ext)s",
-        "postprocessors": [
-            {
-                "key": "FFmpegExtractAudio",
-                "preferredcodec": "mp3",
-                "preferredquality": "192",
-            },
-            {
-                "key": "FFmpegMetadata"
-            },
-        ],
+        "postprocessors": postprocessors,
     }
 
 
@@ -262,12 +449,83 @@ def find_downloaded_file(out_base_path):
     return None
 
 
-def hash_file(path):
-    hasher = hashlib.sha256()
-    with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(1024 * 1024), b""):
-            hasher.update(chunk)
-    return hasher.hexdigest()
+def hash_file(path, threaded=True):
+    if blake3:
+        # Memory-maps the file; threaded hashing spreads one file across cores.
+        hasher = blake3.blake3(max_threads=blake3.blake3.AUTO if threaded else 1)
+        hasher.update_mmap(path)
+        return HASH_PREFIX + hasher.hexdigest()
+    if xxhash:
+        hasher = xxhash.xxh3_64()
+    else:
+        hasher = hashlib.blake2b(digest_size=16)
+    # Read into one reusable buffer; unbuffered since reads are already large.
+    buffer = bytearray(HASH_CHUNK_SIZE)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as f:
+        while size := f.readinto(buffer):
+            hasher.update(view[:size])
+    return HASH_PREFIX + hasher.hexdigest()
+
+
+def cached_hash_entry(rel_path, stat, cache):
+    """Return the cached (hash, size, mtime) if the file is unchanged, else None."""
+    cached = cache.get(rel_path)
+    if (
+        cached
+        and cached[0].startswith(HASH_PREFIX)
+        and cached[1] == stat.st_size
+        and cached[2] == stat.st_mtime
+    ):
+        return cached
+    return None
+
+
+def _hash_file_or_none(path, threaded=True):
+    try:
+        return hash_file(path, threaded)
+    except OSError:
+        return None
+
+
+def hash_files(paths):
+    """Hash paths in order, using threads for larger batches; None marks read errors.
+
+    Pooled files are hashed single-threaded so BLAKE3's own threads do not
+    oversubscribe the CPUs the pool already keeps busy.
+    """
+    if len(paths) < 4:
+        return [_hash_file_or_none(path) for path in paths]
+    with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+        return list(
+            executor.map(lambda path: _hash_file_or_none(path, False), paths)
+        )
+
+
+def iter_audio_entries(base_dir):
+    """Yield DirEntry objects for audio files under base_dir, like os.walk."""
+    stack = [base_dir]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                    continue
+                is_file = entry.is_file()
+            except OSError:
+                continue
+            name = entry.name
+            if (
+                is_file
+                and name != HASH_CACHE_FILENAME
+                and name.lower().endswith(AUDIO_EXTS)
+            ):
+                yield entry
 
 
 def build_audio_hash_index(base_dir):
@@ -278,29 +536,31 @@ def build_audio_hash_index(base_dir):
     cache_path = os.path.join(base_dir, HASH_CACHE_FILENAME)
     cache = load_hash_cache(cache_path, base_dir)
     new_cache = {}
-    for root, _, files in os.walk(base_dir):
-        for filename in files:
-            if filename == HASH_CACHE_FILENAME:
-                continue
-            if not filename.lower().endswith(AUDIO_EXTS):
-                continue
-            path = os.path.join(root, filename)
-            rel_path = os.path.relpath(path, base_dir)
-            try:
-                stat = os.stat(path)
-            except OSError:
-                continue
-            cached = cache.get(rel_path)
-            if cached and cached[1] == stat.st_size and cached[2] == stat.st_mtime:
-                file_hash = cached[0]
-            else:
-                try:
-                    file_hash = hash_file(path)
-                except OSError:
-                    continue
-            hashes.add(file_hash)
-            new_cache[rel_path] = (file_hash, stat.st_size, stat.st_mtime)
-    save_hash_cache(cache_path, new_cache)
+    prefix_len = len(os.path.join(base_dir, ""))
+    misses = []
+    for dir_entry in iter_audio_entries(base_dir):
+        path = dir_entry.path
+        rel_path = path[prefix_len:]
+        try:
+            stat = dir_entry.stat()
+        except OSError:
+            continue
+        entry = cached_hash_entry(rel_path, stat, cache)
+        if entry:
+            hashes.add(entry[0])
+            new_cache[rel_path] = entry
+        else:
+            misses.append((rel_path, path, stat))
+    if misses:
+        debug(f"Hashing {len(misses)} new or changed audio files")
+    miss_hashes = hash_files([path for _, path, _ in misses])
+    for (rel_path, _, stat), file_hash in zip(misses, miss_hashes):
+        if file_hash is None:
+            continue
+        hashes.add(file_hash)
+        new_cache[rel_path] = (file_hash, stat.st_size, stat.st_mtime)
+    if new_cache != cache:
+        save_hash_cache(cache_path, new_cache)
     debug(f"Indexed {len(hashes)} audio files")
     return hashes, cache_path, new_cache
 
@@ -311,31 +571,32 @@ def load_hash_cache(cache_path, base_dir):
         return cache
     try:
         with open(cache_path, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                parts = line.split("\t", 3)
-                if len(parts) != 4:
-                    continue
-                file_hash, rel_path, size_text, mtime_text = parts
-                try:
-                    size = int(size_text)
-                    mtime = float(mtime_text)
-                except ValueError:
-                    continue
-                cache[rel_path] = (file_hash, size, mtime)
+            data = f.read()
     except OSError as exc:
         debug(f"Failed to read hash cache: {exc}")
+        return cache
+    for parts in (line.split("\t", 3) for line in data.split("\n")):
+        if len(parts) != 4:
+            continue
+        file_hash, rel_path, size_text, mtime_text = parts
+        try:
+            size = int(size_text)
+            mtime = float(mtime_text)
+        except ValueError:
+            continue
+        cache[rel_path] = (file_hash, size, mtime)
     return cache
 
 
 def save_hash_cache(cache_path, cache):
     try:
         with open(cache_path, "w", encoding="utf-8") as f:
-            for rel_path in sorted(cache.keys()):
-                file_hash, size, mtime = cache[rel_path]
-                f.write(f"{file_hash}\t{rel_path}\t{size}\t{mtime}\n")
+            f.write(
+                "".join(
+                    f"{file_hash}\t{rel_path}\t{size}\t{mtime}\n"
+                    for rel_path, (file_hash, size, mtime) in sorted(cache.items())
+                )
+            )
     except OSError as exc:
         debug(f"Failed to write hash cache: {exc}")
 
@@ -345,10 +606,14 @@ def set_hash_cache_state(base_dir, cache_path, entries):
     if not cache_path:
         HASH_CACHE_STATE = None
         return
+    paths = {}
+    for rel_path, entry in entries.items():
+        paths.setdefault(entry[0], os.path.join(base_dir, rel_path))
     HASH_CACHE_STATE = {
         "base_dir": base_dir,
         "path": cache_path,
         "entries": entries,
+        "paths": paths,
     }
 
 
@@ -365,6 +630,7 @@ def update_hash_cache(file_path, file_hash):
         debug(f"Failed to stat for cache update: {exc}")
         return
     entries[rel_path] = (file_hash, stat.st_size, stat.st_mtime)
+    HASH_CACHE_STATE["paths"].setdefault(file_hash, file_path)
     try:
         with open(cache_path, "a", encoding="utf-8") as f:
             f.write(f"{file_hash}\t{rel_path}\t{stat.st_size}\t{stat.st_mtime}\n")
@@ -372,28 +638,352 @@ def update_hash_cache(file_path, file_hash):
         debug(f"Failed to append to hash cache: {exc}")
 
 
+def link_duplicate(existing_path, target_path, file_hash=None):
+    """Hardlink target_path to existing_path and record it in the hash cache."""
+    try:
+        os.link(existing_path, target_path)
+    except OSError as exc:
+        debug(f"Failed to link duplicate: {exc}")
+        return False
+    with HASH_LOCK:
+        if file_hash is None and HASH_CACHE_STATE:
+            rel_path = os.path.relpath(existing_path, HASH_CACHE_STATE["base_dir"])
+            entry = HASH_CACHE_STATE["entries"].get(rel_path)
+            file_hash = entry[0] if entry else None
+        if file_hash:
+            update_hash_cache(target_path, file_hash)
+    return True
+
+
+def load_track_index(base_dir, live_paths):
+    """Map Spotify track IDs and YouTube video keys to files still in live_paths.
+
+    Lines for files that are gone are dropped and the file is compacted.
+    """
+    index = {}
+    index_path = os.path.join(base_dir, TRACK_INDEX_FILENAME)
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            lines = f.read().split("\n")
+    except FileNotFoundError:
+        return index
+    except OSError as exc:
+        debug(f"Failed to read track index: {exc}")
+        return index
+    stale = False
+    for parts in (line.split("\t", 1) for line in lines if line):
+        if len(parts) != 2 or parts[1] not in live_paths:
+            stale = True
+            continue
+        if parts[0] in index:
+            stale = True
+        index[parts[0]] = parts[1]
+    if stale:
+        try:
+            with open(index_path, "w", encoding="utf-8") as f:
+                f.write(
+                    "".join(
+                        f"{track_id}\t{rel_path}\n"
+                        for track_id, rel_path in index.items()
+                    )
+                )
+        except OSError as exc:
+            debug(f"Failed to write track index: {exc}")
+    return index
+
+
+def set_track_index_state(base_dir, index):
+    global TRACK_INDEX_STATE
+    TRACK_INDEX_STATE = {
+        "base_dir": base_dir,
+        "path": os.path.join(base_dir, TRACK_INDEX_FILENAME),
+        "index": index,
+    }
+
+
+def youtube_video_key(info):
+    """Track index key for the video a yt-dlp search result resolved to."""
+    if not info:
+        return None
+    entries = info.get("entries")
+    if entries is not None:
+        entries = [entry for entry in entries if entry]
+        info = entries[0] if entries else {}
+    video_id = info.get("id")
+    return f"youtube:{video_id}" if video_id else None
+
+
+def reuse_downloaded(existing, out_base_path):
+    """Stand in for a download whose file is already on disk at existing."""
+    if LINK_DUPLICATES:
+        target = out_base_path + os.path.splitext(existing)[1]
+        if link_duplicate(existing, target):
+            print(f"Already downloaded, linking: {target}")
+            return target
+    print(f"Already downloaded, skipping: {existing}")
+    return None
+
+
+def find_downloaded_track(track_id):
+    """Return the local path of a track downloaded on an earlier run, if any."""
+    if not TRACK_INDEX_STATE or not track_id:
+        return None
+    with HASH_LOCK:
+        rel_path = TRACK_INDEX_STATE["index"].get(track_id)
+    if not rel_path:
+        return None
+    path = os.path.join(TRACK_INDEX_STATE["base_dir"], rel_path)
+    return path if os.path.exists(path) else None
+
+
+def record_downloaded_track(track_id, file_path):
+    if not TRACK_INDEX_STATE or not track_id:
+        return
+    rel_path = os.path.relpath(file_path, TRACK_INDEX_STATE["base_dir"])
+    with HASH_LOCK:
+        TRACK_INDEX_STATE["index"][track_id] = rel_path
+        try:
+            with open(TRACK_INDEX_STATE["path"], "a", encoding="utf-8") as f:
+                f.write(f"{track_id}\t{rel_path}\n")
+        except OSError as exc:
+            debug(f"Failed to append to track index: {exc}")
+
+
+def wait_for_spotify_slot():
+    global SPOTIFY_NEXT_CALL
+    with SPOTIFY_RATE_LOCK:
+        now = time.monotonic()
+        delay = SPOTIFY_NEXT_CALL - now
+        SPOTIFY_NEXT_CALL = max(now, SPOTIFY_NEXT_CALL) + SPOTIFY_MIN_INTERVAL_SECONDS
+    if delay > 0:
+        time.sleep(delay)
+
+
+def spotify_retry_delay(exc, attempt):
+    """Seconds to wait before retrying a failed Spotify call, or None to give up."""
+    status = getattr(exc, "http_status", None)
+    if status == 429:
+        headers = getattr(exc, "headers", None) or {}
+        try:
+            retry_after = int(headers.get("Retry-After", 1))
+        except (TypeError, ValueError):
+            retry_after = 1
+        return min(SPOTIFY_MAX_BACKOFF_SECONDS, max(1, retry_after))
+    if status is not None and 400 <= status < 500:
+        # Bad requests and missing items will not succeed on a retry.
+        return None
+    return min(SPOTIFY_MAX_BACKOFF_SECONDS, 2 ** attempt + random.random())
+
+
 def spotify_call(func, *args, **kwargs):
     for attempt in range(1, SPOTIFY_ATTEMPTS + 1):
+        wait_for_spotify_slot()
         try:
             debug(f"Spotify call attempt {attempt}: {getattr(func, '__name__', 'call')}")
             return func(*args, **kwargs)
         except Exception as exc:
             print(f"Spotify request failed (attempt {attempt}): {exc}")
+            delay = spotify_retry_delay(exc, attempt)
+            if delay is None:
+                break
             if attempt < SPOTIFY_ATTEMPTS:
-                time.sleep(RETRY_SLEEP_SECONDS)
+                time.sleep(delay)
     return None
 
 
+def get_spotify_cache():
+    global SPOTIFY_CACHE_DB
+    if SPOTIFY_CACHE_DB is None:
+        try:
+            SPOTIFY_CACHE_DB = sqlite3.connect(
+                SPOTIFY_CACHE_PATH, check_same_thread=False
+            )
+            # WAL with relaxed syncing keeps the per-response commits cheap;
+            # losing the newest rows in a crash only costs a refetch.
+            SPOTIFY_CACHE_DB.execute("PRAGMA journal_mode=WAL")
+            SPOTIFY_CACHE_DB.execute("PRAGMA synchronous=NORMAL")
+            SPOTIFY_CACHE_DB.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            SPOTIFY_CACHE_DB.execute(
+                "DELETE FROM responses WHERE created < ?",
+                (time.time() - SPOTIFY_CACHE_TTL_SECONDS,),
+            )
+            SPOTIFY_CACHE_DB.commit()
+        except sqlite3.Error as exc:
+            debug(f"Spotify cache unavailable: {exc}")
+            SPOTIFY_CACHE_DB = False
+    return SPOTIFY_CACHE_DB or None
+
+
+def cached_spotify_call(func, *args, ttl=SPOTIFY_CACHE_TTL_SECONDS, **kwargs):
+    """spotify_call backed by an on-disk cache; responses expire after ttl seconds."""
+    name = getattr(func, "__name__", "call")
+    key = json.dumps([name, args, sorted(kwargs.items())], default=str)
+    with SPOTIFY_CACHE_LOCK:
+        db = get_spotify_cache()
+        row = None
+        if db:
+            try:
+                row = db.execute(
+                    "SELECT value FROM responses WHERE key = ? AND created >= ?",
+                    (key, time.time() - ttl),
+                ).fetchone()
+            except sqlite3.Error as exc:
+                debug(f"Failed to read Spotify cache: {exc}")
+    if row:
+        debug(f"Spotify cache hit: {name}")
+        return json.loads(row[0])
+
+    result = spotify_call(func, *args, **kwargs)
+    if result is None:
+        return None
+    with SPOTIFY_CACHE_LOCK:
+        if db:
+            try:
+                db.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, created) "
+                    "VALUES (?, ?, ?)",
+                    (key, json.dumps(result), time.time()),
+                )
+                db.commit()
+            except (sqlite3.Error, TypeError, ValueError) as exc:
+                debug(f"Failed to write Spotify cache: {exc}")
+    return result
+
+
+def clear_spotify_cache():
+    with SPOTIFY_CACHE_LOCK:
+        db = get_spotify_cache()
+        if not db:
+            return
+        try:
+            db.execute("DELETE FROM responses")
+            db.commit()
+        except sqlite3.Error as exc:
+            debug(f"Failed to clear Spotify cache: {exc}")
+
+
+def fetch_all_pages(
+    func,
+    *args,
+    limit,
+    result_key=None,
+    max_results=None,
+    ttl=SPOTIFY_CACHE_TTL_SECONDS,
+    **kwargs,
+):
+    """Collect the items of every page of a paginated Spotify call.
+
+    The first page reports the total, so the remaining pages are requested
+    concurrently; items keep their page order.
+    """
+
+    def fetch_page(offset):
+        response = cached_spotify_call(
+            func, *args, limit=limit, offset=offset, ttl=ttl, **kwargs
+        )
+        if response and result_key:
+            response = response.get(result_key)
+        return response or {}
+
+    first = fetch_page(0)
+    total = first.get("total")
+    if max_results is not None and isinstance(total, int):
+        total = min(total, max_results)
+    offsets = range(limit, total, limit) if isinstance(total, int) else range(0)
+    pages = [first]
+    if len(offsets) > 1 and len(first.get("items") or []) >= limit:
+        with ThreadPoolExecutor(max_workers=SPOTIFY_PAGE_WORKERS) as executor:
+            pages.extend(executor.map(fetch_page, offsets))
+
+    items = []
+    for page in pages:
+        page_items = page.get("items") or []
+        items.extend(page_items)
+        if len(page_items) < limit:
+            return items
+    # The total was missing or stale; keep paging one request at a time.
+    offset = limit * len(pages)
+    while max_results is None or offset < max_results:
+        page_items = fetch_page(offset).get("items") or []
+        items.extend(page_items)
+        if len(page_items) < limit:
+            break
+        offset += limit
+    return items
+
+
+def get_thread_ydl(out_base_path):
+    """Return this thread's YoutubeDL, retargeted to write to out_base_path.
+
+    Reusing one instance per thread avoids reloading extractors and keeps its
+    HTTP connections open between tracks.
+    """
+    ydl = getattr(YDL_LOCAL, "ydl", None)
+    if ydl is not None:
+        outtmpl = ydl.params.get("outtmpl")
+        if isinstance(outtmpl, dict):
+            debug(f"Reusing yt-dlp instance for: {out_base_path}")
+            outtmpl["default"] = f"{out_base_path}.%(ext)s"
+            return ydl
+        # Older yt-dlp releases parse a str outtmpl once at construction, so
+        # the instance cannot be retargeted; start a fresh one instead.
+        discard_thread_ydl()
+    ydl = yt_dlp.YoutubeDL(build_ydl_opts(out_base_path))
+    YDL_LOCAL.ydl = ydl
+    with YDL_INSTANCES_LOCK:
+        YDL_INSTANCES.append(ydl)
+    return ydl
+
+
+def discard_thread_ydl():
+    """Drop this thread's YoutubeDL so the next download starts from a fresh one."""
+    ydl = getattr(YDL_LOCAL, "ydl", None)
+    if ydl is None:
+        return
+    YDL_LOCAL.ydl = None
+    with YDL_INSTANCES_LOCK:
+        if ydl in YDL_INSTANCES:
+            YDL_INSTANCES.remove(ydl)
+    try:
+        ydl.close()
+    except Exception as exc:
+        debug(f"Failed to close yt-dlp instance: {exc}")
+
+
+@atexit.register
+def close_ydl_instances():
+    with YDL_INSTANCES_LOCK:
+        instances = list(YDL_INSTANCES)
+        YDL_INSTANCES.clear()
+    for ydl in instances:
+        try:
+            ydl.close()
+        except Exception as exc:
+            debug(f"Failed to close yt-dlp instance: {exc}")
+
+
 def download_audio(search_query, out_base_path, known_hashes):
-    ydl_opts = build_ydl_opts(out_base_path)
     debug(f"Audio search: {search_query}")
+    video_key = None
     for attempt in range(1, DOWNLOAD_ATTEMPTS + 1):
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([search_query])
+            ydl = get_thread_ydl(out_base_path)
+            # Resolve the search first so a video fetched on an earlier run is
+            # skipped before any download or encode; the resolved info is then
+            # downloaded without searching again.
+            info = ydl.extract_info(search_query, download=False)
+            video_key = youtube_video_key(info)
+            existing = find_downloaded_track(video_key)
+            if existing:
+                return reuse_downloaded(existing, out_base_path)
+            ydl.process_ie_result(info, download=True)
             break
         except Exception as exc:
             print(f"Audio download error (attempt {attempt}): {exc}")
+            discard_thread_ydl()
             if attempt < DOWNLOAD_ATTEMPTS:
                 time.sleep(RETRY_SLEEP_SECONDS)
             else:
@@ -404,32 +994,83 @@ def download_audio(search_query, out_base_path, known_hashes):
         return None
     debug(f"Downloaded file: {downloaded}")
     try:
-        file_hash = hash_file(downloaded)
+        file_hash = hash_file(downloaded, threaded=DOWNLOAD_CONCURRENCY == 1)
     except OSError:
         return downloaded
-    if file_hash in known_hashes:
-        print("Duplicate audio detected, removing:", downloaded)
+    existing = None
+    with HASH_LOCK:
+        duplicate = file_hash in known_hashes
+        if not duplicate:
+            known_hashes.add(file_hash)
+            update_hash_cache(downloaded, file_hash)
+        elif HASH_CACHE_STATE:
+            existing = HASH_CACHE_STATE["paths"].get(file_hash)
+    if duplicate:
+        if existing:
+            record_downloaded_track(video_key, existing)
+        print(f"Duplicate audio detected, removing: {downloaded}")
         try:
             os.remove(downloaded)
         except OSError:
             pass
+        if (
+            LINK_DUPLICATES
+            and existing
+            and existing != downloaded
+            and link_duplicate(existing, downloaded, file_hash)
+        ):
+            print(f"Linked to existing copy: {existing}")
+            return downloaded
         return None
-    known_hashes.add(file_hash)
-    update_hash_cache(downloaded, file_hash)
+    record_downloaded_track(video_key, downloaded)
     return downloaded
 
 
+def _download_one_track(task, known_hashes):
+    message, search_query, out_base, track_id = task
+    existing = find_downloaded_track(track_id)
+    if existing:
+        return reuse_downloaded(existing, out_base)
+    print(message)
+    downloaded = download_audio(search_query, out_base, known_hashes)
+    if downloaded:
+        record_downloaded_track(track_id, downloaded)
+    return downloaded
+
+
+def download_tracks(tasks, known_hashes):
+    """Run (message, search_query, out_base, track_id) tasks in parallel.
+
+    Results keep task order; tracks already downloaded on an earlier run are
+    skipped without searching YouTube.
+    """
+    global DOWNLOAD_EXECUTOR
+    if not tasks:
+        return []
+    if DOWNLOAD_EXECUTOR is None:
+        DOWNLOAD_EXECUTOR = ThreadPoolExecutor(max_workers=DOWNLOAD_CONCURRENCY)
+    return list(
+        DOWNLOAD_EXECUTOR.map(lambda task: _download_one_track(task, known_hashes), tasks)
+    )
+
+
 def get_artist(artist_name):
     artist_key = (artist_name or "").strip()
     artist_id = extract_spotify_artist_id(artist_key)
     if artist_id:
-        artist = spotify_call(sp.artist, artist_id)
+        artist = cached_spotify_call(sp.artist, artist_id)
         if not artist:
             print(f"No artist found for artist ID '{artist_id}'")
             return None
         return artist
 
-    results = spotify_call(sp.search, q=f"artist:{artist_key}", type="artist", limit=1)
+    results = cached_spotify_call(
+        sp.search,
+        q=f"artist:{artist_key}",
+        type="artist",
+        limit=1,
+        ttl=SPOTIFY_SEARCH_CACHE_TTL_SECONDS,
+    )
     if not results:
         print(f"Spotify search failed for artist '{artist_key}'")
         return None
@@ -443,50 +1084,30 @@ def get_artist(artist_name):
 def get_all_albums(artist_id):
     albums = []
     seen = set()
-    offset = 0
     debug(f"Fetching albums for artist ID: {artist_id}")
-    while True:
-        response = spotify_call(
-            sp.artist_albums,
-            artist_id,
-            album_type="album,single",
-            country="IN",
-            limit=50,
-            offset=offset,
-        )
-        if not response:
-            break
-        items = response.get("items", [])
-        if not items:
-            break
-        for album in items:
-            album_id = album.get("id")
-            if not album_id or album_id in seen:
-                continue
-            seen.add(album_id)
-            albums.append(album)
-        if len(items) < 50:
-            break
-        offset += 50
+    items = fetch_all_pages(
+        sp.artist_albums,
+        artist_id,
+        album_type="album,single",
+        country="IN",
+        limit=50,
+    )
+    for album in items:
+        album_id = album.get("id")
+        if not album_id or album_id in seen:
+            continue
+        seen.add(album_id)
+        albums.append(album)
     return albums
 
 
-def get_album_tracks(album_id):
-    tracks = []
-    offset = 0
+def get_album_tracks(album_id, embedded=None):
+    """Return an album's tracks; embedded is the "tracks" page of a full album object."""
+    if embedded and embedded.get("items") and not embedded.get("next"):
+        debug(f"Using embedded tracks for album ID: {album_id}")
+        return embedded["items"]
     debug(f"Fetching tracks for album ID: {album_id}")
-    while True:
-        response = spotify_call(sp.album_tracks, album_id, limit=50, offset=offset)
-        if not response:
-            break
-        items = response.get("items", [])
-        if not items:
-            break
-        tracks.extend(items)
-        if len(items) < 50:
-            break
-        offset += 50
-    return tracks
+    return fetch_all_pages(sp.album_tracks, album_id, limit=50)
 
 
 def download_album_tracks(artist_display_name, album, known_hashes, base_output_folder):
@@ -502,12 +1123,15 @@ def download_album_tracks(artist_display_name, album, known_hashes, base_output_
         download_image(chosen_image.get("url", ""), image_path)
         print(f"Downloaded album art for {album_name}")
 
-    tracks = get_album_tracks(album.get("id"))
+    tracks = get_album_tracks(album.get("id"), album.get("tracks"))
     if not tracks:
         print(f"No tracks found for album: {album_name}")
         return
     debug(f"Track count for album '{album_name}': {len(tracks)}")
 
+    tasks = []
+    reserved = set()
+    existing = list_dir_names(album_folder)
     for track in tracks:
         track_name = track.get("name") or ""
         if not track_name:
@@ -522,11 +1146,16 @@ def download_album_tracks(artist_display_name, album, known_hashes, base_output_
             base_name = f"{track_number:02d} - {track_safe}"
         else:
             base_name = track_safe
-        out_base = unique_base_path(os.path.join(album_folder, base_name))
+        out_base = unique_base_path(
+            os.path.join(album_folder, base_name), reserved, existing
+        )
 
         search_query = f"{artist_display_name} - {track_name}"
-        print(f"Downloading track: {track_name}")
-        download_audio(search_query, out_base, known_hashes)
+        tasks.append(
+            (f"Downloading track: {track_name}", search_query, out_base, track.get("id"))
+        )
+
+    download_tracks(tasks, known_hashes)
 
 
 def download_all_albums_for_artist(artist_name, known_hashes, base_output_folder):
@@ -544,7 +1173,12 @@ def download_all_albums_for_artist(artist_name, known_hashes, base_output_folder
         return
 
     print(f"Found {len(albums)} albums for {artist_display_name}")
+    # Full album objects carry their first page of tracks, saving a call per album.
+    full_albums = fetch_items_by_ids(
+        sp.albums, [album["id"] for album in albums], "albums", 20
+    )
     for album in albums:
+        album = full_albums.get(album["id"], album)
         album_title = album.get("name", "Unknown Album")
         print(f"Downloading album: {album_title}")
         download_album_tracks(
@@ -556,8 +1190,8 @@ def parse_song_entry(entry):
     entry = entry.strip()
     if not entry:
         return "", ""
-    if "," in entry:
-        song, artist = entry.split(",", 1)
+    song, sep, artist = entry.partition(",")
+    if sep:
         return song.strip(), artist.strip()
     return entry, ""
 
@@ -566,8 +1200,8 @@ def parse_album_entry(entry):
     entry = entry.strip()
     if not entry:
         return "", ""
-    if "," in entry:
-        album, artist = entry.split(",", 1)
+    album, sep, artist = entry.partition(",")
+    if sep:
         return album.strip(), artist.strip()
     return entry, ""
 
@@ -576,8 +1210,8 @@ def parse_playlist_entry(entry):
     entry = entry.strip()
     if not entry:
         return "", ""
-    if "," in entry:
-        playlist, owner = entry.split(",", 1)
+    playlist, sep, owner = entry.partition(",")
+    if sep:
         return playlist.strip(), owner.strip()
     return entry, ""
 
@@ -651,26 +1285,22 @@ def playlist_has_owner(playlist, owner_name):
 def search_albums_by_name(album_name):
     albums = []
     seen = set()
-    offset = 0
     debug(f"Searching albums by name: {album_name}")
-    while True:
-        results = spotify_call(
-            sp.search, q=f"album:{album_name}", type="album", limit=50, offset=offset
-        )
-        if not results:
-            break
-        items = results.get("albums", {}).get("items", [])
-        if not items:
-            break
-        for album in items:
-            album_id = album.get("id")
-            if not album_id or album_id in seen:
-                continue
-            seen.add(album_id)
-            albums.append(album)
-        if len(items) < 50:
-            break
-        offset += 50
+    items = fetch_all_pages(
+        sp.search,
+        q=f"album:{album_name}",
+        type="album",
+        limit=50,
+        result_key="albums",
+        max_results=SPOTIFY_SEARCH_MAX_RESULTS,
+        ttl=SPOTIFY_SEARCH_CACHE_TTL_SECONDS,
+    )
+    for album in items:
+        album_id = album.get("id")
+        if not album_id or album_id in seen:
+            continue
+        seen.add(album_id)
+        albums.append(album)
     return albums
 
 
@@ -689,16 +1319,36 @@ def get_album_by_name(album_name, artist_name):
     return items[0]
 
 
-def get_album_by_id(album_id):
-    album = spotify_call(sp.album, album_id)
+def fetch_items_by_ids(func, ids, key, batch_size):
+    """Look up ids through a batched Spotify endpoint; returns {id: item}."""
+    items = {}
+    unique_ids = list(dict.fromkeys(ids))
+    for start in range(0, len(unique_ids), batch_size):
+        batch = unique_ids[start:start + batch_size]
+        debug(f"Batched Spotify lookup ({key}): {len(batch)} IDs")
+        response = cached_spotify_call(func, batch)
+        if not response:
+            continue
+        for item in response.get(key) or []:
+            if item and item.get("id"):
+                items[item["id"]] = item
+    return items
+
+
+def get_album_by_id(album_id, prefetched=None):
+    album = (prefetched or {}).get(album_id)
+    if not album:
+        album = cached_spotify_call(sp.album, album_id)
     if not album:
         print(f"No album found for album ID '{album_id}'")
         return None
     return album
 
 
-def get_track_by_id(track_id):
-    track = spotify_call(sp.track, track_id)
+def get_track_by_id(track_id, prefetched=None):
+    track = (prefetched or {}).get(track_id)
+    if not track:
+        track = cached_spotify_call(sp.track, track_id)
     if not track:
         print(f"No track found for track ID '{track_id}'")
         return None
@@ -708,33 +1358,25 @@ def get_track_by_id(track_id):
 def search_tracks_by_name(song_name, artist_name):
     tracks = []
     seen = set()
-    offset = 0
     query = f"track:{song_name}"
     if artist_name:
         query += f" artist:{artist_name}"
     debug(f"Searching tracks by query: {query}")
-    while True:
-        results = spotify_call(
-            sp.search,
-            q=query,
-            type="track",
-            limit=50,
-            offset=offset,
-        )
-        if not results:
-            break
-        items = results.get("tracks", {}).get("items", [])
-        if not items:
-            break
-        for track in items:
-            track_id = track.get("id")
-            if not track_id or track_id in seen:
-                continue
-            seen.add(track_id)
-            tracks.append(track)
-        if len(items) < 50:
-            break
-        offset += 50
+    items = fetch_all_pages(
+        sp.search,
+        q=query,
+        type="track",
+        limit=50,
+        result_key="tracks",
+        max_results=SPOTIFY_SEARCH_MAX_RESULTS,
+        ttl=SPOTIFY_SEARCH_CACHE_TTL_SECONDS,
+    )
+    for track in items:
+        track_id = track.get("id")
+        if not track_id or track_id in seen:
+            continue
+        seen.add(track_id)
+        tracks.append(track)
     return tracks
 
 
@@ -765,11 +1407,13 @@ def find_single_track_for_song(song_name, artist_name):
     return None
 
 
-def resolve_song_to_single_album(song_name, artist_name):
+def resolve_song_to_single_album(
+    song_name, artist_name, prefetched_tracks=None, prefetched_albums=None
+):
     track_id = extract_spotify_track_id(song_name)
     source_track = None
     if track_id:
-        source_track = get_track_by_id(track_id)
+        source_track = get_track_by_id(track_id, prefetched_tracks)
         if not source_track:
             return None, ""
         if artist_name and not track_has_artist(source_track, artist_name):
@@ -781,7 +1425,7 @@ def resolve_song_to_single_album(song_name, artist_name):
             return None, ""
         source_album = source_track.get("album") or {}
         if source_album.get("album_type") == "single" and source_album.get("id"):
-            album = get_album_by_id(source_album["id"])
+            album = get_album_by_id(source_album["id"], prefetched_albums)
             artist_name_display = resolve_artist_display(source_track, artist_name)
             return album, artist_name_display
         track_artists = source_track.get("artists") or []
@@ -813,30 +1457,22 @@ def resolve_song_to_single_album(song_name, artist_name):
 def search_playlists_by_name(playlist_name):
     playlists = []
     seen = set()
-    offset = 0
     debug(f"Searching playlists by name: {playlist_name}")
-    while True:
-        results = spotify_call(
-            sp.search,
-            q=f"playlist:{playlist_name}",
-            type="playlist",
-            limit=50,
-            offset=offset,
-        )
-        if not results:
-            break
-        items = results.get("playlists", {}).get("items", [])
-        if not items:
-            break
-        for playlist in items:
-            playlist_id = playlist.get("id")
-            if not playlist_id or playlist_id in seen:
-                continue
-            seen.add(playlist_id)
-            playlists.append(playlist)
-        if len(items) < 50:
-            break
-        offset += 50
+    items = fetch_all_pages(
+        sp.search,
+        q=f"playlist:{playlist_name}",
+        type="playlist",
+        limit=50,
+        result_key="playlists",
+        max_results=SPOTIFY_SEARCH_MAX_RESULTS,
+        ttl=SPOTIFY_SEARCH_CACHE_TTL_SECONDS,
+    )
+    for playlist in items:
+        playlist_id = playlist.get("id")
+        if not playlist_id or playlist_id in seen:
+            continue
+        seen.add(playlist_id)
+        playlists.append(playlist)
     return playlists
 
 
@@ -858,7 +1494,9 @@ def get_playlist_by_name(playlist_name, owner_name):
 
 
 def get_playlist_by_id(playlist_id):
-    playlist = spotify_call(sp.playlist, playlist_id)
+    playlist = cached_spotify_call(
+        sp.playlist, playlist_id, ttl=SPOTIFY_SEARCH_CACHE_TTL_SECONDS
+    )
     if not playlist:
         print(f"No playlist found for playlist ID '{playlist_id}'")
         return None
@@ -867,31 +1505,21 @@ def get_playlist_by_id(playlist_id):
 
 def get_playlist_tracks(playlist_id):
     tracks = []
-    offset = 0
     debug(f"Fetching tracks for playlist ID: {playlist_id}")
-    while True:
-        response = spotify_call(
-            sp.playlist_items,
-            playlist_id,
-            additional_types=("track",),
-            limit=100,
-            offset=offset,
-        )
-        if not response:
-            break
-        items = response.get("items", [])
-        if not items:
-            break
-        for item in items:
-            track = item.get("track") or {}
-            if track.get("type") != "track":
-                continue
-            if not track.get("id"):
-                continue
-            tracks.append(track)
-        if len(items) < 100:
-            break
-        offset += 100
+    items = fetch_all_pages(
+        sp.playlist_items,
+        playlist_id,
+        additional_types=("track",),
+        limit=100,
+        ttl=SPOTIFY_SEARCH_CACHE_TTL_SECONDS,
+    )
+    for item in items:
+        track = item.get("track") or {}
+        if track.get("type") != "track":
+            continue
+        if not track.get("id"):
+            continue
+        tracks.append(track)
     return tracks
 
 
@@ -931,7 +1559,10 @@ def download_playlist_tracks(playlist, known_hashes, base_output_folder):
         return
     debug(f"Track count for playlist '{playlist_name}': {len(tracks)}")
 
-    playlist_entries = []
+    tasks = []
+    titles = []
+    reserved = set()
+    existing = list_dir_names(playlist_folder)
     for index, track in enumerate(tracks, start=1):
         track_name = (track.get("name") or "").strip()
         if not track_name:
@@ -948,14 +1579,28 @@ def download_playlist_tracks(playlist, known_hashes, base_output_folder):
         artist_safe = sanitize_filename(artist_name_display) if artist_name_display else "Unknown"
         track_safe = sanitize_filename(track_name)
         base_name = f"{index:03d} - {artist_safe} - {track_safe}"
-        out_base = unique_base_path(os.path.join(playlist_folder, base_name))
+        out_base = unique_base_path(
+            os.path.join(playlist_folder, base_name), reserved, existing
+        )
 
-        print(f"Downloading playlist track: {track_name}")
-        downloaded_path = download_audio(search_query, out_base, known_hashes)
+        tasks.append(
+            (
+                f"Downloading playlist track: {track_name}",
+                search_query,
+                out_base,
+                track.get("id"),
+            )
+        )
+        titles.append(f"{artist_name_display} - {track_name}")
+
+    playlist_entries = []
+    # Every download lands under playlist_folder, so its relative path is a slice.
+    prefix_len = len(os.path.join(playlist_folder, ""))
+    for title, downloaded_path in zip(titles, download_tracks(tasks, known_hashes)):
         if not downloaded_path:
             continue
-        rel_path = os.path.relpath(downloaded_path, playlist_folder).replace("\\", "/")
-        playlist_entries.append((f"{artist_name_display} - {track_name}", rel_path))
+        rel_path = downloaded_path[prefix_len:].replace("\\", "/")
+        playlist_entries.append((title, rel_path))
 
     write_playlist_m3u(playlist_folder, playlist_entries)
 
@@ -995,24 +1640,45 @@ def resolve_artist_display(item, fallback):
 
 
 def download_albums_from_list(entries, known_hashes, base_output_folder):
-    for entry in entries:
-        album_name, artist_name = parse_album_entry(entry)
+    parsed = [parse_album_entry(entry) for entry in entries]
+    album_ids = [extract_spotify_album_id(album_name) for album_name, _ in parsed]
+    searches = list(
+        dict.fromkeys(
+            (album_name, artist_name)
+            for (album_name, artist_name), album_id in zip(parsed, album_ids)
+            if album_name and not album_id and not is_instrumental_text(album_name)
+        )
+    )
+    with ThreadPoolExecutor(max_workers=SPOTIFY_PAGE_WORKERS) as executor:
+        results = executor.map(lambda search: get_album_by_name(*search), searches)
+        found = dict(zip(searches, results))
+    # Search results are simplified albums; fetch them in full alongside the
+    # ID entries so their tracks come embedded.
+    prefetched = fetch_items_by_ids(
+        sp.albums,
+        [album_id for album_id in album_ids if album_id]
+        + [album["id"] for album in found.values() if album and album.get("id")],
+        "albums",
+        20,
+    )
+    for (album_name, artist_name), album_id in zip(parsed, album_ids):
         if not album_name:
             continue
         if is_instrumental_text(album_name):
             print(f"Skipping instrumental album entry: {album_name}")
             continue
 
-        album_id = extract_spotify_album_id(album_name)
         if album_id:
-            album = get_album_by_id(album_id)
+            album = get_album_by_id(album_id, prefetched)
             if not album:
                 continue
             if artist_name and not album_has_artist(album, artist_name):
                 print(f"Album ID '{album_id}' does not match artist '{artist_name}'")
                 continue
         else:
-            album = get_album_by_name(album_name, artist_name)
+            album = found.get((album_name, artist_name))
+            if album:
+                album = prefetched.get(album.get("id"), album)
         if not album:
             continue
 
@@ -1023,11 +1689,23 @@ def download_albums_from_list(entries, known_hashes, base_output_folder):
 
 def download_songs_from_list(entries, known_hashes, base_output_folder):
     downloaded_single_ids = set()
-    for entry in entries:
-        song_name, artist_name = parse_song_entry(entry)
+    parsed = [parse_song_entry(entry) for entry in entries]
+    track_ids = [extract_spotify_track_id(song_name) for song_name, _ in parsed]
+    prefetched_tracks = fetch_items_by_ids(
+        sp.tracks, [track_id for track_id in track_ids if track_id], "tracks", 50
+    )
+    single_ids = []
+    for track in prefetched_tracks.values():
+        album = track.get("album") or {}
+        if album.get("album_type") == "single" and album.get("id"):
+            single_ids.append(album["id"])
+    prefetched_albums = fetch_items_by_ids(sp.albums, single_ids, "albums", 20)
+    for song_name, artist_name in parsed:
         if not song_name:
             continue
-        album, artist_name_display = resolve_song_to_single_album(song_name, artist_name)
+        album, artist_name_display = resolve_song_to_single_album(
+            song_name, artist_name, prefetched_tracks, prefetched_albums
+        )
         if not album:
             continue
         album_id = album.get("id")
@@ -1041,22 +1719,34 @@ def download_songs_from_list(entries, known_hashes, base_output_folder):
             downloaded_single_ids.add(album_id)
 
 
+@lru_cache(maxsize=1)
+def placeholder_image_bytes():
+    """Read the placeholder image once; None if it is missing."""
+    try:
+        with open(PLACEHOLDER_IMAGE, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
 def copy_placeholder_image(dest_folder):
-    if not os.path.exists(PLACEHOLDER_IMAGE):
+    data = placeholder_image_bytes()
+    if data is None:
         print(f"Placeholder image not found: {PLACEHOLDER_IMAGE}")
         return
     dest_path = os.path.join(dest_folder, os.path.basename(PLACEHOLDER_IMAGE))
     if os.path.exists(dest_path):
         return
-    shutil.copy2(PLACEHOLDER_IMAGE, dest_path)
+    with open(dest_path, "wb") as f:
+        f.write(data)
 
 
 def group_songs_into_artist_folders(downloaded, base_output_folder):
-    artist_map = {}
+    artist_map = defaultdict(list)
     for artist_name, file_path in downloaded:
         if not artist_name or not file_path:
             continue
-        artist_map.setdefault(artist_name, []).append(file_path)
+        artist_map[artist_name].append(file_path)
 
     for artist_name, files in artist_map.items():
         if len(files) < 2:
@@ -1064,15 +1754,23 @@ def group_songs_into_artist_folders(downloaded, base_output_folder):
         folder_name = sanitize_filename(artist_name)
         artist_folder = os.path.join(base_output_folder, folder_name)
         os.makedirs(artist_folder, exist_ok=True)
+        # Paths are built from the absolute output folder, so normpath is enough
+        # to compare them; abspath would also consult the working directory.
+        artist_folder_norm = os.path.normpath(artist_folder)
 
         for file_path in files:
             if not os.path.exists(file_path):
                 continue
-            dest_path = os.path.join(artist_folder, os.path.basename(file_path))
-            if os.path.abspath(file_path) == os.path.abspath(dest_path):
+            if os.path.dirname(os.path.normpath(file_path)) == artist_folder_norm:
                 continue
-            dest_path = unique_file_path(dest_path)
-            shutil.move(file_path, dest_path)
+            dest_path = unique_file_path(
+                os.path.join(artist_folder, os.path.basename(file_path))
+            )
+            try:
+                # A plain rename when both paths share a filesystem.
+                os.replace(file_path, dest_path)
+            except OSError:
+                shutil.move(file_path, dest_path)
 
         copy_placeholder_image(artist_folder)
 
@@ -1105,6 +1803,9 @@ def main():
     os.makedirs(base_output_folder, exist_ok=True)
     known_hashes, cache_path, cache_entries = build_audio_hash_index(base_output_folder)
     set_hash_cache_state(base_output_folder, cache_path, cache_entries)
+    set_track_index_state(
+        base_output_folder, load_track_index(base_output_folder, cache_entries)
+    )
     mode, input_path = resolve_input_file()
     if not input_path:
         print("No songs.txt, album.txt, playlist.txt, or artist.txt found in the script folder.")